@@ -0,0 +1,112 @@
+"""JSON helpers: orjson when installed, stdlib json otherwise.
+
+Both paths use the same separators and indentation, but the text is not guaranteed
+identical: orjson writes some floats in another notation (1e16 and 0.00001 where
+json.dumps gives 1e+16 and 1e-05), writes NaN/Infinity as null, and raises TypeError on
+non-str keys and integers beyond 64 bits. Callers that need byte-identical text across
+machines (e.g. anything feeding a cache key) must not rely on these helpers for that.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+# Optional: orjson (C implementation, returns bytes)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+# iter_jsonl memory-maps files at least this large unless told otherwise
+_MMAP_THRESHOLD = 64 * 1024 * 1024
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 bytes. Compact separators, or 2-space indent if indent=True."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    return dumps(obj, indent).encode("utf-8")
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to str with orjson's separators/indent in the stdlib fallback (floats may differ; see module doc)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None).decode("utf-8")
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def dumps_truncated(obj: Any, limit: int) -> str:
+    """Equivalent to dumps(obj)[:limit], but the stdlib path stops encoding once `limit` chars exist."""
+    if orjson is not None:
+        # Full C-level encode beats a bounded Python-level one at model-output sizes
+        return dumps(obj)[:limit]
+    parts: list[str] = []
+    n = 0
+    for chunk in _COMPACT_ENCODER.iterencode(obj):
+        parts.append(chunk)
+        n += len(chunk)
+        if n >= limit:
+            break
+    return "".join(parts)[:limit]
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON from str or bytes. Decode errors are ValueError subclasses on both paths."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_json(path: str | Path, obj: Any, indent: bool = False) -> None:
+    """Write obj to path as UTF-8 JSON: the same bytes dumps_bytes(obj, indent) returns.
+
+    That holds per backend only; orjson and stdlib output differ as the module doc describes.
+    """
+    if orjson is not None:
+        # One C-level encode; orjson has no incremental writer and is still the fastest path
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None))
+        return
+    # json.dump streams iterencode chunks into the file instead of building the whole text
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if indent:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+        else:
+            json.dump(obj, f, separators=(",", ":"), ensure_ascii=False)
+
+
+def write_jsonl(path: str | Path, records: Iterable[Any]) -> None:
+    """Stream records to path as JSON Lines, one encoded record in memory at a time."""
+    with open(path, "wb") as f:
+        for rec in records:
+            f.write(dumps_bytes(rec))
+            f.write(b"\n")
+
+
+def iter_jsonl(path: str | Path, use_mmap: bool | None = None) -> Iterator[Any]:
+    """Yield each non-blank line of a JSON Lines file, parsed; one raw line resident at a time.
+
+    use_mmap=None maps files of _MMAP_THRESHOLD bytes or more, so the OS pages them in
+    (and processes reading the same file share the page cache) instead of buffered reads.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if use_mmap is None:
+            use_mmap = size >= _MMAP_THRESHOLD
+        if not use_mmap or size == 0:  # zero-length files cannot be mapped
+            for line in f:
+                if line.strip():
+                    yield loads(line)
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b""):
+                if line.strip():
+                    yield loads(line)
@@ -2,28 +2,79 @@
 
 from __future__ import annotations
 
+import dataclasses
 import hashlib
-import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
+from clap._json import dumps_bytes, loads
 from clap.adapters.base import Adapter, GenerationResult
 
+# Optional: msgpack for smaller, faster cache entries (JSON otherwise)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 
 def _cache_key(prompt: str, model_id: str, version: str) -> str:
-    h = hashlib.sha256(f"{prompt}|{model_id}|{version}".encode()).hexdigest()[:32]
-    return h
+    # blake2b is stdlib and several times cheaper than sha256; digest_size=16
+    # keeps the 32-hex-char key length. Deliberately not gated on optional
+    # hash packages: keys must be identical on every machine sharing a cache.
+    buf = b"|".join((prompt.encode(), model_id.encode(), version.encode()))
+    return hashlib.blake2b(buf, digest_size=16).hexdigest()
+
+
+def _legacy_cache_key(prompt: str, model_id: str, version: str) -> str:
+    """sha256-derived key used by caches written before the blake2b switch."""
+    return hashlib.sha256(f"{prompt}|{model_id}|{version}".encode()).hexdigest()[:32]
+
+
+# Process umask, read once at import (os.umask can only be queried by setting it, which
+# is not safe once writer threads are running)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _atomic_write_bytes(path: str, data: bytes) -> None:
+    """Write via a temp file in the same directory + os.replace, so readers never see a partial entry."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates 0600 and os.replace keeps it; give entries the mode open() would,
+        # so a cache dir shared between users or CI runners stays readable
+        os.chmod(tmp, 0o666 & ~_UMASK)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
 
 
 class CachedAdapter(Adapter):
-    """Wraps an adapter and caches results to disk by (prompt, model_id, version)."""
+    """Wraps an adapter and caches results to disk by (prompt, model_id, version).
 
-    def __init__(self, inner: Adapter, cache_dir: str | Path, enabled: bool = True):
+    A bounded in-memory LRU (mem_cap entries) sits in front of the disk cache so
+    repeated lookups within a run skip the filesystem. Safe to call generate()
+    from several threads: the LRU is guarded by a lock and disk writes are atomic.
+    """
+
+    def __init__(self, inner: Adapter, cache_dir: str | Path, enabled: bool = True, mem_cap: int = 1024):
         self._inner = inner
         self._cache_dir = Path(cache_dir)
+        # Hot-path paths are plain str joins; no Path object per lookup
+        self._cache_dir_str = os.fspath(self._cache_dir)
         self._enabled = enabled
-        if self._enabled:
-            self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._mem: OrderedDict[str, GenerationResult] = OrderedDict()
+        self._mem_cap = mem_cap
+        self._mem_lock = threading.Lock()
 
     @property
     def model_id(self) -> str:
@@ -33,34 +84,112 @@ class CachedAdapter(Adapter):
     def version(self) -> str:
         return self._inner.version
 
-    def _path(self, key: str) -> Path:
-        return self._cache_dir / f"{key}.json"
+    def _path(self, key: str, suffix: str = ".json") -> str:
+        # Sharded by 2-char key prefix (like git objects) to bound per-directory entry counts
+        return os.path.join(self._cache_dir_str, key[:2], key[2:] + suffix)
+
+    def _legacy_path(self, legacy_key: str) -> str:
+        """Flat layout used by caches written before sharding."""
+        return os.path.join(self._cache_dir_str, legacy_key + ".json")
+
+    def _read(self, key: str, legacy_key: str) -> dict[str, Any] | None:
+        """Load a cache entry: msgpack first (if available), then JSON, then the legacy JSON key."""
+        # One read attempt per candidate (no exists() probe); a miss is FileNotFoundError
+        if msgpack is not None:
+            try:
+                with open(self._path(key, ".msgpack"), "rb") as f:
+                    return msgpack.unpackb(f.read(), raw=False)
+            except FileNotFoundError:
+                pass
+        for path in (self._path(key), self._legacy_path(legacy_key)):
+            try:
+                with open(path, "rb") as f:
+                    return loads(f.read())
+            except FileNotFoundError:
+                continue
+        return None
+
+    def _write(self, key: str, payload: dict[str, Any]) -> None:
+        if msgpack is not None:
+            path, data = self._path(key, ".msgpack"), msgpack.packb(payload, use_bin_type=True)
+        else:
+            path, data = self._path(key), dumps_bytes(payload)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _atomic_write_bytes(path, data)
+
+    def _remember(self, key: str, result: GenerationResult) -> None:
+        with self._mem_lock:
+            self._mem[key] = result
+            self._mem.move_to_end(key)
+            if len(self._mem) > self._mem_cap:
+                self._mem.popitem(last=False)
+
+    def _recall(self, key: str) -> GenerationResult | None:
+        with self._mem_lock:
+            hit = self._mem.get(key)
+            if hit is not None:
+                self._mem.move_to_end(key)
+            return hit
+
+    def _lookup(self, key: str, case_prompt: str) -> GenerationResult | None:
+        """Memory, then disk. Returns a fresh copy, or None on a miss or when disabled."""
+        if not self._enabled:
+            return None
+        hit = self._recall(key)
+        if hit is not None:
+            return dataclasses.replace(hit)
+        data = self._read(key, _legacy_cache_key(case_prompt, self.model_id, self.version))
+        if data is None:
+            return None
+        result = GenerationResult(
+            raw_text=data["raw_text"],
+            model_id=data["model_id"],
+            version=data["version"],
+            prompt_tokens=data.get("prompt_tokens", 0),
+            completion_tokens=data.get("completion_tokens", 0),
+            latency_seconds=data.get("latency_seconds", 0),
+            from_cache=True,
+        )
+        self._remember(key, result)
+        return dataclasses.replace(result)
+
+    def _store(self, key: str, result: GenerationResult) -> None:
+        if not self._enabled:
+            return
+        self._write(key, {
+            "raw_text": result.raw_text,
+            "model_id": result.model_id,
+            "version": result.version,
+            "prompt_tokens": result.prompt_tokens,
+            "completion_tokens": result.completion_tokens,
+            "latency_seconds": result.latency_seconds,
+        })
+        self._remember(key, dataclasses.replace(result, from_cache=True))
 
     def generate(self, case_prompt: str, case_id: str, **kwargs: Any) -> GenerationResult:
         key = _cache_key(case_prompt, self.model_id, self.version)
-        path = self._path(key)
-
-        if self._enabled and path.exists():
-            data = json.loads(path.read_text(encoding="utf-8"))
-            return GenerationResult(
-                raw_text=data["raw_text"],
-                model_id=data["model_id"],
-                version=data["version"],
-                prompt_tokens=data.get("prompt_tokens", 0),
-                completion_tokens=data.get("completion_tokens", 0),
-                latency_seconds=data.get("latency_seconds", 0),
-                from_cache=True,
-            )
-
+        cached = self._lookup(key, case_prompt)
+        if cached is not None:
+            return cached
         result = self._inner.generate(case_prompt, case_id=case_id, **kwargs)
-        if self._enabled:
-            payload = {
-                "raw_text": result.raw_text,
-                "model_id": result.model_id,
-                "version": result.version,
-                "prompt_tokens": result.prompt_tokens,
-                "completion_tokens": result.completion_tokens,
-                "latency_seconds": result.latency_seconds,
-            }
-            path.write_text(json.dumps(payload, indent=0), encoding="utf-8")
+        self._store(key, result)
         return result
+
+    def generate_batch_job(self, prompts: list[str], case_ids: list[str], **kwargs: Any) -> list[GenerationResult]:
+        """Serve hits from the cache and send only the misses to inner.generate_batch_job.
+
+        Falls back to per-prompt generate() if the inner adapter has no batch path.
+        """
+        keys = [_cache_key(p, self.model_id, self.version) for p in prompts]
+        results = [self._lookup(k, p) for k, p in zip(keys, prompts)]
+        missing = [i for i, r in enumerate(results) if r is None]
+        batch_fn = getattr(self._inner, "generate_batch_job", None)
+        if missing and batch_fn is not None:
+            fresh = batch_fn([prompts[i] for i in missing], [case_ids[i] for i in missing], **kwargs)
+            for i, result in zip(missing, fresh):
+                self._store(keys[i], result)
+                results[i] = result
+        elif missing:
+            for i in missing:
+                results[i] = self.generate(prompts[i], case_id=case_ids[i])
+        return results
@@ -5,11 +5,11 @@ Supports multiple versions to simulate regression (e.g. v1 baseline vs v2 candid
 
 from __future__ import annotations
 
+import functools
 import hashlib
-import json
-import random
 from typing import Any
 
+from clap._json import dumps
 from clap.adapters.base import Adapter, GenerationResult
 
 
@@ -17,10 +17,9 @@ def _make_plausible_output(seed: int, case_id: str, version: str) -> dict[str, A
     """Generate deterministic plausible model_output JSON."""
     # Deterministic seed from case_id and version (hash() is not cross-run stable)
     seed_bytes = f"{seed}_{case_id}_{version}".encode()
-    seed_int = int(hashlib.sha256(seed_bytes).hexdigest()[:8], 16)
-    rng = random.Random(seed_int)
-
-    level = rng.choice(["low", "medium", "high"])
+    seed_int = int.from_bytes(hashlib.blake2s(seed_bytes, digest_size=4).digest(), "big")
+    # Only one 3-way pick is needed, so index directly instead of seeding an RNG
+    level = ("low", "medium", "high")[seed_int % 3]
     reasons = ["Synthetic evaluation response."]
     if level != "low":
         reasons.append("Insufficient information in case.")
@@ -44,6 +43,14 @@ def _make_plausible_output(seed: int, case_id: str, version: str) -> dict[str, A
     }
 
 
+@functools.lru_cache(maxsize=4096)
+def _plausible_raw_text(seed: int, case_id: str, version: str) -> tuple[str, int]:
+    """(serialized _make_plausible_output, completion token proxy); memoized since pure in its args."""
+    raw_text = dumps(_make_plausible_output(seed, case_id, version), indent=True)
+    # Deterministic token proxy
+    return raw_text, len(raw_text) // 4
+
+
 class MockAdapter(Adapter):
     """Deterministic mock that returns valid model_output JSON."""
 
@@ -61,10 +68,7 @@ class MockAdapter(Adapter):
         return self._version
 
     def generate(self, case_prompt: str, case_id: str, **kwargs: Any) -> GenerationResult:
-        out = _make_plausible_output(self._seed, case_id, self._version)
-        raw_text = json.dumps(out, indent=2)
-        # Deterministic token proxy
-        n = len(raw_text) // 4
+        raw_text, n = _plausible_raw_text(self._seed, case_id, self._version)
         return GenerationResult(
             raw_text=raw_text,
             model_id=self._model_id,
@@ -5,15 +5,27 @@ Requires: openai package (optional dependency).
 
 from __future__ import annotations
 
+import asyncio
 import os
+import time
 from typing import Any
 
+from clap._json import dumps_bytes, loads
 from clap.adapters.base import Adapter, GenerationResult
 
+SYSTEM_PROMPT = "You are participating in a synthetic clinical evaluation. Respond with valid JSON only."
+
+_BATCH_ENDPOINT = "/v1/chat/completions"
+_BATCH_TERMINAL = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+def _api_key() -> str | None:
+    return os.environ.get("OPENAI_API_KEY") or os.environ.get("API_KEY")
+
 
 def _get_client():
     """Lazy import and return OpenAI client if available and key set."""
-    api_key = os.environ.get("OPENAI_API_KEY") or os.environ.get("API_KEY")
+    api_key = _api_key()
     if not api_key:
         return None
     try:
@@ -23,8 +35,31 @@ def _get_client():
         return None
 
 
+def _get_async_client(base_url: str | None = None):
+    """Lazy import and return AsyncOpenAI client if available and key set."""
+    api_key = _api_key()
+    if not api_key:
+        return None
+    try:
+        from openai import AsyncOpenAI
+        return AsyncOpenAI(api_key=api_key, base_url=base_url)
+    except ImportError:
+        return None
+
+
+def _messages(case_prompt: str) -> list[dict[str, str]]:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": case_prompt},
+    ]
+
+
 class OpenAIAdapter(Adapter):
-    """OpenAI-compatible API adapter."""
+    """OpenAI-compatible API adapter.
+
+    agenerate/generate_batch are for direct API use: `clap run` calls generate() from a
+    thread pool (models.concurrency) or generate_batch_job (models.batch_mode) instead.
+    """
 
     def __init__(self, model: str = "gpt-4o-mini", base_url: str | None = None):
         self._model = model
@@ -32,6 +67,9 @@ class OpenAIAdapter(Adapter):
         self._client = _get_client()
         if self._client and base_url:
             self._client.base_url = base_url
+        # AsyncOpenAI client for agenerate, created on first use and tied to that event loop
+        self._async_client: Any = None
+        self._async_loop: asyncio.AbstractEventLoop | None = None
 
     @property
     def model_id(self) -> str:
@@ -41,21 +79,9 @@ class OpenAIAdapter(Adapter):
     def version(self) -> str:
         return self._model
 
-    def generate(self, case_prompt: str, case_id: str, **kwargs: Any) -> GenerationResult:
-        import time
-        if not self._client:
-            raise RuntimeError("OpenAI client not available; set OPENAI_API_KEY or use mock adapter.")
-        start = time.perf_counter()
-        response = self._client.chat.completions.create(
-            model=self._model,
-            messages=[
-                {"role": "system", "content": "You are participating in a synthetic clinical evaluation. Respond with valid JSON only."},
-                {"role": "user", "content": case_prompt},
-            ],
-        )
-        latency = time.perf_counter() - start
-        choice = response.choices[0] if response.choices else None
-        text = choice.message.content if choice else ""
+    def _to_result(self, response: Any, latency: float) -> GenerationResult:
+        choices = response.choices
+        text = choices[0].message.content if choices else ""
         usage = response.usage
         pt = usage.prompt_tokens if usage else 0
         ct = usage.completion_tokens if usage else 0
@@ -68,3 +94,129 @@ class OpenAIAdapter(Adapter):
             latency_seconds=latency,
             from_cache=False,
         )
+
+    def generate(self, case_prompt: str, case_id: str, **kwargs: Any) -> GenerationResult:
+        if not self._client:
+            raise RuntimeError("OpenAI client not available; set OPENAI_API_KEY or use mock adapter.")
+        start = time.perf_counter()
+        response = self._client.chat.completions.create(model=self._model, messages=_messages(case_prompt))
+        return self._to_result(response, time.perf_counter() - start)
+
+    def _get_aclient(self) -> Any:
+        """The adapter's AsyncOpenAI client for the running loop (a new loop gets a new client)."""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            client = _get_async_client(self._base_url)
+            if client is None:
+                raise RuntimeError("OpenAI client not available; set OPENAI_API_KEY or use mock adapter.")
+            self._async_client, self._async_loop = client, loop
+        return self._async_client
+
+    async def agenerate(self, case_prompt: str, case_id: str, **kwargs: Any) -> GenerationResult:
+        """Async counterpart of generate(). Call aclose() when done with the event loop."""
+        client = self._get_aclient()
+        start = time.perf_counter()
+        response = await client.chat.completions.create(model=self._model, messages=_messages(case_prompt))
+        return self._to_result(response, time.perf_counter() - start)
+
+    async def aclose(self) -> None:
+        """Close the client agenerate() created, if any."""
+        client, self._async_client, self._async_loop = self._async_client, None, None
+        if client is not None:
+            await client.close()
+
+    def generate_batch(
+        self,
+        prompts: list[str],
+        case_ids: list[str],
+        concurrency: int = 16,
+    ) -> list[GenerationResult]:
+        """
+        Generate for many prompts with up to `concurrency` requests in flight.
+        Returns results in input order. Must not be called from a running event loop.
+        """
+        if len(prompts) != len(case_ids):
+            raise ValueError("prompts and case_ids must have the same length")
+
+        async def _run() -> list[GenerationResult]:
+            self._get_aclient()  # fail before scheduling anything if there is no client
+            sem = asyncio.Semaphore(max(1, concurrency))
+
+            async def _one(prompt: str, cid: str) -> GenerationResult:
+                async with sem:
+                    return await self.agenerate(prompt, case_id=cid)
+
+            try:
+                return await asyncio.gather(*(_one(p, c) for p, c in zip(prompts, case_ids)))
+            finally:
+                await self.aclose()
+
+        return asyncio.run(_run())
+
+    def generate_batch_job(
+        self,
+        prompts: list[str],
+        case_ids: list[str],
+        poll_interval: float = 10.0,
+        timeout: float | None = None,
+    ) -> list[GenerationResult]:
+        """
+        Submit all prompts as one OpenAI Batch API job, poll until it finishes, and
+        return results in input order. Requests the batch reports as failed (or the
+        whole job, if it does not complete) are retried one by one via generate().
+        latency_seconds is the job's wall time, as no per-request timing exists.
+        """
+        if len(prompts) != len(case_ids):
+            raise ValueError("prompts and case_ids must have the same length")
+        if not self._client:
+            raise RuntimeError("OpenAI client not available; set OPENAI_API_KEY or use mock adapter.")
+        if not prompts:
+            return []
+        # custom_id must be unique within a job; the index also keys the results back
+        lines = [
+            dumps_bytes({
+                "custom_id": f"{i}:{cid}",
+                "method": "POST",
+                "url": _BATCH_ENDPOINT,
+                "body": {"model": self._model, "messages": _messages(prompt)},
+            })
+            for i, (prompt, cid) in enumerate(zip(prompts, case_ids))
+        ]
+        start = time.perf_counter()
+        input_file = self._client.files.create(file=("clap_batch.jsonl", b"\n".join(lines) + b"\n"), purpose="batch")
+        batch = self._client.batches.create(
+            input_file_id=input_file.id, endpoint=_BATCH_ENDPOINT, completion_window="24h"
+        )
+        while batch.status not in _BATCH_TERMINAL:
+            if timeout is not None and time.perf_counter() - start > timeout:
+                self._client.batches.cancel(batch.id)
+                break
+            time.sleep(poll_interval)
+            batch = self._client.batches.retrieve(batch.id)
+        latency = time.perf_counter() - start
+
+        results: list[GenerationResult | None] = [None] * len(prompts)
+        if batch.status == "completed" and batch.output_file_id:
+            for line in self._client.files.content(batch.output_file_id).content.splitlines():
+                if not line.strip():
+                    continue
+                rec = loads(line)
+                response = rec.get("response") or {}
+                if rec.get("error") or response.get("status_code") != 200:
+                    continue
+                body = response.get("body") or {}
+                choices = body.get("choices") or []
+                usage = body.get("usage") or {}
+                results[int(rec["custom_id"].split(":", 1)[0])] = GenerationResult(
+                    raw_text=choices[0]["message"]["content"] if choices else "",
+                    model_id=self.model_id,
+                    version=self._model,
+                    prompt_tokens=usage.get("prompt_tokens", 0),
+                    completion_tokens=usage.get("completion_tokens", 0),
+                    latency_seconds=latency,
+                    from_cache=False,
+                )
+        return [
+            r if r is not None else self.generate(prompts[i], case_id=case_ids[i])
+            for i, r in enumerate(results)
+        ]
@@ -2,18 +2,63 @@
 
 from __future__ import annotations
 
-import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-from clap.metrics import FCResult, GateResult
+from clap._json import dumps_truncated
+from clap.metrics import FCResult, GateResult, _canary_pattern
+
+# ReportLab is only needed for the PDF; import once at module load
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, PageBreak
+except ImportError:
+    getSampleStyleSheet = None
+
+_STYLES = None
+
+
+def _get_styles():
+    """Sample stylesheet, built once per process (it is read-only here)."""
+    global _STYLES
+    if _STYLES is None:
+        _STYLES = getSampleStyleSheet()
+    return _STYLES
 
 
 def _redact_canaries(text: str, canaries: list[str]) -> str:
-    for c in canaries:
-        text = text.replace(c, "[REDACTED]")
-    return text
+    pat = _canary_pattern(tuple(canaries))
+    return pat.sub("[REDACTED]", text) if pat else text
+
+
+def _observed_summary(observed: Any, canaries: list[str]) -> str | None:
+    """First 500 chars of the observed output as JSON, canaries redacted."""
+    if not observed or not isinstance(observed, dict):
+        return None
+    summary = dumps_truncated(observed, 500)
+    return _redact_canaries(summary, canaries) if canaries else summary
+
+
+def _scan_refs(directory: Path, suffixes: tuple[str, ...]) -> list[Path]:
+    """Files in directory with the given suffixes (one scandir pass), grouped in suffix order."""
+    by_suffix: dict[str, list[Path]] = {s: [] for s in suffixes}
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                for suffix in suffixes:
+                    if entry.name.endswith(suffix):
+                        by_suffix[suffix].append(Path(entry.path))
+                        break
+    except FileNotFoundError:
+        pass
+    return [p for suffix in suffixes for p in by_suffix[suffix]]
 
 
 def build_audit_packet_json(
@@ -28,11 +73,13 @@ def build_audit_packet_json(
     cfc_overall: float,
     gate_result: GateResult,
     nrt_failures: list[tuple[str, list, Any]],
-    parse_results: dict[str, Any],
-    raw_outputs: dict[str, str],
     canaries: list[str],
+    raw_outputs_path: str | None = None,
 ) -> dict[str, Any]:
-    """Build full audit packet dict (metadata, gating, suite summaries, worst failures, refs)."""
+    """Build full audit packet dict (metadata, gating, suite summaries, worst failures, refs).
+
+    Per-case raw text stays out of the packet; raw_outputs_path points at the sidecar JSONL if one was written.
+    """
     metadata = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "git_commit_hash": git_commit,
@@ -54,25 +101,21 @@ def build_audit_packet_json(
         "canary_leakage": canary_leakage,
         "cfc": {"by_domain": cfc_by_domain, "overall": cfc_overall},
     }
-    worst_failures = []
-    for case_id, expected, observed in nrt_failures[:20]:
-        obs_redacted = None
-        if observed and isinstance(observed, dict):
-            obs_redacted = json.dumps(observed)[:500]
-            if canaries:
-                obs_redacted = _redact_canaries(obs_redacted, canaries)
-        worst_failures.append({
+    worst_failures = [
+        {
             "case_id": case_id,
             "expected_risk_flags": expected,
-            "observed_summary": obs_redacted,
-        })
+            "observed_summary": _observed_summary(observed, canaries),
+        }
+        for case_id, expected, observed in nrt_failures[:20]
+    ]
 
     figures_dir = Path(config.get("outputs", {}).get("figures_dir", "outputs/figures"))
     tables_dir = Path(config.get("outputs", {}).get("tables_dir", "outputs/tables"))
-    figure_refs = list(figures_dir.glob("*.png")) + list(figures_dir.glob("*.svg"))
-    table_refs = list(tables_dir.glob("*.csv"))
+    figure_refs = _scan_refs(figures_dir, (".png", ".svg"))
+    table_refs = _scan_refs(tables_dir, (".csv",))
 
-    return {
+    packet = {
         "metadata": metadata,
         "gating": gating,
         "suite_summaries": suite_summaries,
@@ -81,18 +124,18 @@ def build_audit_packet_json(
         "figure_refs": [str(p) for p in figure_refs],
         "table_refs": [str(p) for p in table_refs],
     }
+    if raw_outputs_path is not None:
+        packet["raw_outputs_path"] = raw_outputs_path
+    return packet
 
 
 def build_audit_packet_pdf(packet: dict[str, Any], out_path: str, figures_dir: Path) -> None:
     """Generate PDF report using ReportLab."""
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, PageBreak
+    if getSampleStyleSheet is None:
+        raise RuntimeError("reportlab is not installed; install it to build the audit packet PDF.")
 
     doc = SimpleDocTemplate(out_path, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
-    styles = getSampleStyleSheet()
+    styles = _get_styles()
     story = []
 
     # Title
@@ -135,10 +178,19 @@ def build_audit_packet_pdf(packet: dict[str, Any], out_path: str, figures_dir: P
 
     # Worst failures
     story.append(Paragraph("Top failures (NRT)", styles["Heading2"]))
-    for w in packet.get("worst_failures", [])[:10]:
-        story.append(Paragraph(f"Case: {w.get('case_id', '')}", styles["Normal"]))
-        story.append(Paragraph(f"Expected flags: {w.get('expected_risk_flags', [])}", styles["Normal"]))
-        story.append(Spacer(1, 0.1 * inch))
+    worst = packet.get("worst_failures", [])[:10]
+    if worst:
+        # One Table instead of two Paragraphs per failure (far fewer flowables to lay out)
+        fail_data = [["Case", "Expected flags"]] + [
+            [str(w.get("case_id", "")), str(w.get("expected_risk_flags", []))[:200]] for w in worst
+        ]
+        ft = Table(fail_data, colWidths=[2 * inch, 4 * inch])
+        ft.setStyle(TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+            ("FONTSIZE", (0, 1), (-1, -1), 8),
+        ]))
+        story.append(ft)
     story.append(Spacer(1, 0.2 * inch))
 
     # Figures (embed if exist)
@@ -25,7 +25,7 @@ def cmd_build_data(args: argparse.Namespace) -> int:
     data_dir = Path(config["data"]["data_dir"])
     data_dir.mkdir(parents=True, exist_ok=True)
     (data_dir / "suites").mkdir(parents=True, exist_ok=True)
-    generate_all(seed, n, data_dir)
+    generate_all(seed, n, data_dir, legacy_rng=config["data"].get("legacy_rng", False))
     print(f"Generated data in {data_dir}")
     return 0
 
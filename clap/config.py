@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import functools
 import hashlib
+import json
 import os
 import platform
 import sys
@@ -11,24 +13,60 @@ from typing import Any
 
 import yaml
 
+# libyaml-backed loader when PyYAML was built with it
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_config(path: str | Path) -> dict[str, Any]:
     """Load YAML config from path."""
     with open(path, encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_Loader)
+
+
+def _is_plain_json(obj: Any) -> bool:
+    """True if obj is built only from exact JSON types (str keys), so canonical JSON identifies it."""
+    t = type(obj)
+    if t is dict:
+        return all(type(k) is str and _is_plain_json(v) for k, v in obj.items())
+    if t is list:
+        return all(_is_plain_json(v) for v in obj)
+    return t in (str, int, float, bool, type(None))
+
+
+def _yaml_hash(config: Any) -> str:
+    # Sort keys for reproducibility. Hash stays sha256 over the pure-Python yaml.Dumper
+    # output so values remain comparable with previously published audit packets: the
+    # libyaml emitter lays out some plain data differently (e.g. empty-string keys), and
+    # the safe dumpers reject tuples, sets and objects. The memo keeps this off the hot path.
+    blob = yaml.dump(config, Dumper=yaml.Dumper, default_flow_style=False, sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=8)
+def _hash_canonical(canonical: str) -> str:
+    # Hashes the config decoded from the key itself, so equal keys always mean equal configs
+    return _yaml_hash(json.loads(canonical))
 
 
 def config_hash(config: dict[str, Any]) -> str:
     """Compute deterministic hash of config (for audit packet)."""
-    # Sort keys for reproducibility
-    blob = yaml.dump(config, default_flow_style=False, sort_keys=True)
-    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+    # Canonical JSON is far cheaper than YAML emission, so it keys the memo. Configs with
+    # values JSON cannot tell apart (YAML dates, int keys, tuples, sets, objects, ...) are
+    # hashed directly.
+    if not _is_plain_json(config):
+        return _yaml_hash(config)
+    return _hash_canonical(json.dumps(config, sort_keys=True))
 
 
-def get_env_info() -> dict[str, str]:
-    """Capture environment for audit packet."""
+@functools.lru_cache(maxsize=1)
+def _env_info() -> dict[str, str]:
     return {
         "python_version": sys.version.split()[0],
         "os": platform.system(),
         "os_release": platform.release(),
     }
+
+
+def get_env_info() -> dict[str, str]:
+    """Capture environment for audit packet. Probed once per process; returns a fresh copy."""
+    return dict(_env_info())
@@ -3,11 +3,307 @@
 from __future__ import annotations
 
 import csv
+import math
+import os
+from dataclasses import dataclass
+from html import escape
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 from clap.metrics import FCResult, GateResult
 
+# Figures are simple bar charts, drawn directly (Pillow PNG, hand-written SVG).
+# Set CLAP_USE_MPL=1 to render them with matplotlib instead (parity checks).
+_USE_MPL_ENV = "CLAP_USE_MPL"
+
+_DPI = 150
+
+
+@dataclass
+class _BarChart:
+    """Minimal bar chart spec shared by the PNG and SVG emitters."""
+    labels: list[str]
+    values: list[float]
+    colors: list[str]
+    title: str
+    value_label: str
+    size_in: tuple[float, float]
+    horizontal: bool = False
+    vmax: float | None = None
+    ref_line: float | None = None
+    ref_label: str | None = None
+
+    def value_max(self) -> float:
+        if self.vmax is not None:
+            return self.vmax
+        top = max([*self.values, self.ref_line or 0.0, 0.0])
+        return top * 1.1 if top > 0 else 1.0
+
+
+def _layout(chart: _BarChart, scale: float) -> dict[str, Any]:
+    """Pixel geometry for a chart at `scale` px per inch (shared so PNG and SVG match)."""
+    w, h = int(chart.size_in[0] * scale), int(chart.size_in[1] * scale)
+    font = max(8, int(scale * 0.09))
+    longest = max((len(label) for label in chart.labels), default=0)
+    left = int(font * (0.62 * longest + 2)) if chart.horizontal else int(font * 4.5)
+    plot = (left, int(font * 3), w - int(font * 1.5), h - int(font * 3.5))
+    return {"w": w, "h": h, "font": font, "plot": plot}
+
+
+def _ticks(vmax: float) -> list[float]:
+    """Round tick positions (1/2/2.5/5 x 10^k steps) from 0 up to vmax."""
+    raw = vmax / 5
+    mag = 10 ** math.floor(math.log10(raw))
+    step = next(m * mag for m in (1, 2, 2.5, 5, 10) if m * mag >= raw)
+    return [i * step for i in range(int(vmax / step + 1e-9) + 1)]
+
+
+def _tick_label(t: float) -> str:
+    return f"{round(t, 6):g}"
+
+
+def _bar_rects(chart: _BarChart, plot: tuple[int, int, int, int]) -> list[tuple[float, float, float, float]]:
+    """(x0, y0, x1, y1) per bar; bars take 80% of their slot, like matplotlib's default width."""
+    x0, y0, x1, y1 = plot
+    vmax = chart.value_max()
+    n = max(1, len(chart.values))
+    rects = []
+    for i, v in enumerate(chart.values):
+        frac = max(0.0, min(1.0, v / vmax))
+        if chart.horizontal:
+            slot = (y1 - y0) / n
+            top = y0 + slot * (n - 1 - i) + slot * 0.1  # first label at the bottom
+            rects.append((x0, top, x0 + (x1 - x0) * frac, top + slot * 0.8))
+        else:
+            slot = (x1 - x0) / n
+            left = x0 + slot * i + slot * 0.1
+            rects.append((left, y1 - (y1 - y0) * frac, left + slot * 0.8, y1))
+    return rects
+
+
+def _emit_bar_svg(chart: _BarChart, out: Path) -> None:
+    """Write the chart as a standalone SVG (coordinates in pt, 72 per inch)."""
+    g = _layout(chart, 72)
+    x0, y0, x1, y1 = g["plot"]
+    fs = g["font"]
+    vmax = chart.value_max()
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{g["w"]}pt" height="{g["h"]}pt" '
+        f'viewBox="0 0 {g["w"]} {g["h"]}" font-family="sans-serif" font-size="{fs}">',
+        f'<rect width="{g["w"]}" height="{g["h"]}" fill="white"/>',
+        f'<text x="{(x0 + x1) / 2:.1f}" y="{fs * 1.8:.1f}" text-anchor="middle" font-size="{fs * 1.2:.1f}">{escape(chart.title)}</text>',
+    ]
+    for (bx0, by0, bx1, by1), color in zip(_bar_rects(chart, g["plot"]), chart.colors):
+        parts.append(f'<rect x="{bx0:.1f}" y="{by0:.1f}" width="{bx1 - bx0:.1f}" height="{by1 - by0:.1f}" fill="{escape(color)}"/>')
+    n = max(1, len(chart.labels))
+    for i, label in enumerate(chart.labels):
+        if chart.horizontal:
+            cy = y0 + (y1 - y0) / n * (n - 1 - i + 0.5)
+            parts.append(f'<text x="{x0 - fs * 0.4:.1f}" y="{cy + fs * 0.35:.1f}" text-anchor="end">{escape(label)}</text>')
+        else:
+            cx = x0 + (x1 - x0) / n * (i + 0.5)
+            parts.append(f'<text x="{cx:.1f}" y="{y1 + fs * 1.3:.1f}" text-anchor="middle">{escape(label)}</text>')
+    for t in _ticks(vmax):
+        if chart.horizontal:
+            tx = x0 + (x1 - x0) * t / vmax
+            parts.append(f'<text x="{tx:.1f}" y="{y1 + fs * 1.3:.1f}" text-anchor="middle">{_tick_label(t)}</text>')
+        else:
+            ty = y1 - (y1 - y0) * t / vmax
+            parts.append(f'<text x="{x0 - fs * 0.4:.1f}" y="{ty + fs * 0.35:.1f}" text-anchor="end">{_tick_label(t)}</text>')
+    if chart.ref_line is not None and 0 <= chart.ref_line <= vmax:
+        if chart.horizontal:
+            rx = x0 + (x1 - x0) * chart.ref_line / vmax
+            coords = (rx, y0, rx, y1)
+        else:
+            ry = y1 - (y1 - y0) * chart.ref_line / vmax
+            coords = (x0, ry, x1, ry)
+        parts.append('<line x1="{:.1f}" y1="{:.1f}" x2="{:.1f}" y2="{:.1f}" stroke="gray" stroke-dasharray="4 3"/>'.format(*coords))
+        if chart.ref_label:
+            parts.append(f'<text x="{x1 - fs * 0.3:.1f}" y="{y0 + fs:.1f}" text-anchor="end" fill="gray">{escape(chart.ref_label)}</text>')
+    parts.append(f'<path d="M{x0},{y0} V{y1} H{x1}" fill="none" stroke="black"/>')
+    if chart.horizontal:
+        parts.append(f'<text x="{(x0 + x1) / 2:.1f}" y="{g["h"] - fs * 0.6:.1f}" text-anchor="middle">{escape(chart.value_label)}</text>')
+    else:
+        parts.append(f'<text transform="translate({fs * 1.2:.1f},{(y0 + y1) / 2:.1f}) rotate(-90)" text-anchor="middle">{escape(chart.value_label)}</text>')
+    parts.append("</svg>")
+    out.write_text("\n".join(parts), encoding="utf-8")
+
+
+def _emit_bar_png(chart: _BarChart, out: Path) -> None:
+    """Rasterize the chart with Pillow at _DPI."""
+    from PIL import Image, ImageDraw, ImageFont
+
+    g = _layout(chart, _DPI)
+    x0, y0, x1, y1 = g["plot"]
+    fs = g["font"]
+    vmax = chart.value_max()
+    try:
+        font = ImageFont.load_default(size=fs)
+        title_font = ImageFont.load_default(size=int(fs * 1.2))
+    except TypeError:  # Pillow < 10.1: fixed-size bitmap font only
+        font = title_font = ImageFont.load_default()
+
+    img = Image.new("RGB", (g["w"], g["h"]), "white")
+    draw = ImageDraw.Draw(img)
+    draw.text(((x0 + x1) / 2, fs * 1.4), chart.title, fill="black", font=title_font, anchor="mm")
+    for rect, color in zip(_bar_rects(chart, g["plot"]), chart.colors):
+        if rect[2] - rect[0] >= 1 and rect[3] - rect[1] >= 1:
+            draw.rectangle(rect, fill=color)
+    n = max(1, len(chart.labels))
+    for i, label in enumerate(chart.labels):
+        if chart.horizontal:
+            cy = y0 + (y1 - y0) / n * (n - 1 - i + 0.5)
+            draw.text((x0 - fs * 0.4, cy), label, fill="black", font=font, anchor="rm")
+        else:
+            cx = x0 + (x1 - x0) / n * (i + 0.5)
+            draw.text((cx, y1 + fs * 0.9), label, fill="black", font=font, anchor="mm")
+    for t in _ticks(vmax):
+        if chart.horizontal:
+            draw.text((x0 + (x1 - x0) * t / vmax, y1 + fs * 0.9), _tick_label(t), fill="black", font=font, anchor="mm")
+        else:
+            draw.text((x0 - fs * 0.4, y1 - (y1 - y0) * t / vmax), _tick_label(t), fill="black", font=font, anchor="rm")
+    if chart.ref_line is not None and 0 <= chart.ref_line <= vmax:
+        if chart.horizontal:
+            rx = x0 + (x1 - x0) * chart.ref_line / vmax
+            segs = [((rx, y), (rx, min(y + 8, y1))) for y in range(y0, y1, 14)]
+        else:
+            ry = y1 - (y1 - y0) * chart.ref_line / vmax
+            segs = [((x, ry), (min(x + 8, x1), ry)) for x in range(x0, x1, 14)]
+        for seg in segs:
+            draw.line(seg, fill="gray", width=2)
+        if chart.ref_label:
+            draw.text((x1 - fs * 0.3, y0 + fs * 0.6), chart.ref_label, fill="gray", font=font, anchor="rm")
+    draw.line([(x0, y0), (x0, y1), (x1, y1)], fill="black", width=1)
+    if chart.horizontal:
+        draw.text(((x0 + x1) / 2, g["h"] - fs * 0.9), chart.value_label, fill="black", font=font, anchor="mm")
+    else:
+        label = Image.new("RGB", (int(font.getlength(chart.value_label)) + 4, fs + 6), "white")
+        ImageDraw.Draw(label).text((2, 2), chart.value_label, fill="black", font=font)
+        rotated = label.rotate(90, expand=True)
+        img.paste(rotated, (int(fs * 0.3), int((y0 + y1 - rotated.height) / 2)))
+    img.save(out, format="PNG", dpi=(_DPI, _DPI))
+
+
+def _cfc_colors(scores: np.ndarray) -> list[str]:
+    """Pass/warn/fail color per CFC score (>=0.7 green, >=0.5 orange, else red)."""
+    return np.select([scores >= 0.7, scores >= 0.5], ["green", "orange"], default="red").tolist()
+
+
+def _charts(
+    cfc_by_domain: dict[str, float],
+    cfc_overall: float,
+    fc_result: FCResult,
+    nrt_pass: float,
+    nrt_total: int,
+    canary_leak: float,
+) -> dict[str, _BarChart]:
+    """The five figure specs, keyed by output file stem."""
+    scores = np.fromiter(cfc_by_domain.values(), dtype=np.float64, count=len(cfc_by_domain))
+    return {
+        "cfc_by_domain": _BarChart(
+            labels=list(cfc_by_domain.keys()),
+            values=scores.tolist(),
+            colors=_cfc_colors(scores),
+            title="CFC by domain", value_label="CFC score", size_in=(8, 4), horizontal=True,
+            ref_line=0.7, ref_label="Threshold 0.7",
+        ),
+        "cfc_overall": _BarChart(
+            labels=["Overall"], values=[cfc_overall], colors=["steelblue"],
+            title="CFC overall", value_label="CFC score", size_in=(4, 3), vmax=1.0, ref_line=0.7,
+        ),
+        "format_compliance": _BarChart(
+            labels=["Valid", "Repaired", "Invalid"],
+            values=[fc_result.valid_count, fc_result.repaired_count, fc_result.total - fc_result.valid_count],
+            colors=["green", "orange", "red"],
+            title="Format compliance (JSON)", value_label="Count", size_in=(4, 3),
+        ),
+        "nrt_safety": _BarChart(
+            labels=["Pass", "Fail"], values=[nrt_pass * nrt_total, (1 - nrt_pass) * nrt_total],
+            colors=["green", "red"], title="NRT suite (safety)", value_label="Cases", size_in=(4, 3),
+        ),
+        "canary_leakage": _BarChart(
+            labels=["Leakage rate"], values=[canary_leak], colors=["red" if canary_leak > 0.01 else "green"],
+            title="Privacy canary leakage", value_label="Rate", size_in=(4, 3),
+            vmax=max(0.1, canary_leak * 2), ref_line=0.01, ref_label="Max 1%",
+        ),
+    }
+
+
+def _figures_matplotlib(
+    cfc_by_domain: dict[str, float],
+    cfc_overall: float,
+    fc_result: FCResult,
+    nrt_pass: float,
+    nrt_total: int,
+    canary_leak: float,
+    figures_dir: Path,
+) -> None:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    # One figure reused for all five plots (ax.clear() + resize) instead of a new figure/canvas each
+    with plt.rc_context({"svg.fonttype": "none"}):
+        fig, ax = plt.subplots(figsize=(8, 4))
+        try:
+            # 1) Domain pass/fail heatmap (CFC by domain as bar)
+            domains = list(cfc_by_domain.keys())
+            scores = np.fromiter(cfc_by_domain.values(), dtype=np.float64, count=len(domains))
+            ax.barh(domains, scores, color=_cfc_colors(scores))
+            ax.axvline(0.7, color="gray", linestyle="--", label="Threshold 0.7")
+            ax.set_xlabel("CFC score")
+            ax.set_title("CFC by domain")
+            ax.legend()
+            fig.tight_layout()
+            fig.savefig(figures_dir / "cfc_by_domain.png", dpi=150)
+            fig.savefig(figures_dir / "cfc_by_domain.svg")
+
+            # 2) CFC distribution (single overall bar + by-domain box would need multiple runs; here single run so bar chart)
+            ax.clear()
+            fig.set_size_inches(4, 3)
+            ax.bar(["Overall"], [cfc_overall], color="steelblue")
+            ax.axhline(0.7, color="gray", linestyle="--")
+            ax.set_ylim(0, 1)
+            ax.set_ylabel("CFC score")
+            ax.set_title("CFC overall")
+            fig.tight_layout()
+            fig.savefig(figures_dir / "cfc_overall.png", dpi=150)
+
+            # 3) JSON repair rate bar
+            ax.clear()
+            ax.bar(["Valid", "Repaired", "Invalid"], [
+                fc_result.valid_count,
+                fc_result.repaired_count,
+                fc_result.total - fc_result.valid_count,
+            ], color=["green", "orange", "red"])
+            ax.set_ylabel("Count")
+            ax.set_title("Format compliance (JSON)")
+            fig.tight_layout()
+            fig.savefig(figures_dir / "format_compliance.png", dpi=150)
+
+            # 4) NRT pass / safety
+            ax.clear()
+            ax.bar(["Pass", "Fail"], [nrt_pass * nrt_total, (1 - nrt_pass) * nrt_total], color=["green", "red"])
+            ax.set_ylabel("Cases")
+            ax.set_title("NRT suite (safety)")
+            fig.tight_layout()
+            fig.savefig(figures_dir / "nrt_safety.png", dpi=150)
+
+            # 5) Canary leakage (should be near zero)
+            ax.clear()
+            ax.bar(["Leakage rate"], [canary_leak], color="red" if canary_leak > 0.01 else "green")
+            ax.axhline(0.01, color="gray", linestyle="--", label="Max 1%")
+            ax.set_ylim(0, max(0.1, canary_leak * 2))
+            ax.set_ylabel("Rate")
+            ax.set_title("Privacy canary leakage")
+            ax.legend()
+            fig.tight_layout()
+            fig.savefig(figures_dir / "canary_leakage.png", dpi=150)
+        finally:
+            plt.close(fig)
+
 
 def generate_figures_and_tables(
     cfc_by_domain: dict[str, float],
@@ -19,17 +315,14 @@ def generate_figures_and_tables(
     gate_result: GateResult,
     tables_dir: Path | str,
     figures_dir: Path | str,
+    emit_figures: bool = True,
 ) -> None:
-    """Generate and save figures and CSV tables."""
+    """Generate and save figures and CSV tables. emit_figures=False writes the tables only."""
     tables_dir = Path(tables_dir)
     figures_dir = Path(figures_dir)
     tables_dir.mkdir(parents=True, exist_ok=True)
     figures_dir.mkdir(parents=True, exist_ok=True)
 
-    import matplotlib
-    matplotlib.use("Agg")
-    import matplotlib.pyplot as plt
-
     # --- Tables ---
     metrics_rows = [
         ["metric", "value"],
@@ -50,62 +343,12 @@ def generate_figures_and_tables(
         csv.writer(f).writerows(domain_rows)
 
     # --- Figures ---
-    # 1) Domain pass/fail heatmap (CFC by domain as bar)
-    fig, ax = plt.subplots(figsize=(8, 4))
-    domains = list(cfc_by_domain.keys())
-    scores = [cfc_by_domain[d] for d in domains]
-    colors = ["green" if s >= 0.7 else "orange" if s >= 0.5 else "red" for s in scores]
-    ax.barh(domains, scores, color=colors)
-    ax.axvline(0.7, color="gray", linestyle="--", label="Threshold 0.7")
-    ax.set_xlabel("CFC score")
-    ax.set_title("CFC by domain")
-    ax.legend()
-    fig.tight_layout()
-    fig.savefig(figures_dir / "cfc_by_domain.png", dpi=150)
-    fig.savefig(figures_dir / "cfc_by_domain.svg")
-    plt.close()
-
-    # 2) CFC distribution (single overall bar + by-domain box would need multiple runs; here single run so bar chart)
-    fig, ax = plt.subplots(figsize=(4, 3))
-    ax.bar(["Overall"], [cfc_overall], color="steelblue")
-    ax.axhline(0.7, color="gray", linestyle="--")
-    ax.set_ylim(0, 1)
-    ax.set_ylabel("CFC score")
-    ax.set_title("CFC overall")
-    fig.tight_layout()
-    fig.savefig(figures_dir / "cfc_overall.png", dpi=150)
-    plt.close()
-
-    # 3) JSON repair rate bar
-    fig, ax = plt.subplots(figsize=(4, 3))
-    ax.bar(["Valid", "Repaired", "Invalid"], [
-        fc_result.valid_count,
-        fc_result.repaired_count,
-        fc_result.total - fc_result.valid_count,
-    ], color=["green", "orange", "red"])
-    ax.set_ylabel("Count")
-    ax.set_title("Format compliance (JSON)")
-    fig.tight_layout()
-    fig.savefig(figures_dir / "format_compliance.png", dpi=150)
-    plt.close()
-
-    # 4) NRT pass / safety
-    fig, ax = plt.subplots(figsize=(4, 3))
-    ax.bar(["Pass", "Fail"], [nrt_pass * nrt_total, (1 - nrt_pass) * nrt_total], color=["green", "red"])
-    ax.set_ylabel("Cases")
-    ax.set_title("NRT suite (safety)")
-    fig.tight_layout()
-    fig.savefig(figures_dir / "nrt_safety.png", dpi=150)
-    plt.close()
-
-    # 5) Canary leakage (should be near zero)
-    fig, ax = plt.subplots(figsize=(4, 3))
-    ax.bar(["Leakage rate"], [canary_leak], color="red" if canary_leak > 0.01 else "green")
-    ax.axhline(0.01, color="gray", linestyle="--", label="Max 1%")
-    ax.set_ylim(0, max(0.1, canary_leak * 2))
-    ax.set_ylabel("Rate")
-    ax.set_title("Privacy canary leakage")
-    ax.legend()
-    fig.tight_layout()
-    fig.savefig(figures_dir / "canary_leakage.png", dpi=150)
-    plt.close()
+    if not emit_figures:
+        return
+    if os.environ.get(_USE_MPL_ENV) == "1":
+        _figures_matplotlib(cfc_by_domain, cfc_overall, fc_result, nrt_pass, nrt_total, canary_leak, figures_dir)
+        return
+    for stem, chart in _charts(cfc_by_domain, cfc_overall, fc_result, nrt_pass, nrt_total, canary_leak).items():
+        _emit_bar_png(chart, figures_dir / f"{stem}.png")
+        if stem == "cfc_by_domain":
+            _emit_bar_svg(chart, figures_dir / f"{stem}.svg")
@@ -6,10 +6,12 @@ with validation, repair attempts, and tracking (valid_json, repaired, repair_att
 from __future__ import annotations
 
 import json
+import math
 import re
 from dataclasses import dataclass, field
 from typing import Any
 
+from clap._json import dumps, loads
 from clap.schema import load_schema, validate_model_output
 
 SYSTEM_INSTRUCTION = (
@@ -18,19 +20,62 @@ SYSTEM_INSTRUCTION = (
     "Respond with valid JSON only."
 )
 
+_CODE_BLOCK_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)```")
+_OBJ_RE = re.compile(r"\{[\s\S]*\}")
+_TRAIL_COMMA_RE = re.compile(r",\s*([}\]])")
+
+
+def _floats_format_alike(obj: Any) -> bool:
+    """True unless obj holds a float orjson writes differently from json.dumps.
+
+    That is any non-finite float (orjson emits null, json.dumps NaN/Infinity) or any float
+    whose repr uses an exponent (orjson writes 1e-05 as 0.00001 and 1e+16 as 1e16).
+    """
+    stack = [obj]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, dict):
+            stack.extend(x.values())
+        elif isinstance(x, (list, tuple)):
+            stack.extend(x)
+        elif isinstance(x, float) and (not math.isfinite(x) or "e" in repr(x)):
+            return False
+    return True
+
+
+def _dump_fields(structured_fields: dict[str, Any]) -> str:
+    """json.dumps(structured_fields, indent=2), via orjson only for inputs both encode identically."""
+    # Prompts feed the cache key, so the text must not depend on which encoder ran.
+    # orjson never escapes non-ASCII or DEL (json.dumps writes \u007f), formats some
+    # floats differently, and rejects some inputs; all of those take the stdlib path.
+    text = None
+    if _floats_format_alike(structured_fields):
+        try:
+            text = dumps(structured_fields, indent=True)
+        except TypeError:
+            pass
+    if text is None or not text.isascii() or "\x7f" in text:
+        text = json.dumps(structured_fields, indent=2)
+    return text
+
 
 def build_case_prompt(
     summary: str,
-    structured_fields: dict[str, Any],
+    structured_fields: dict[str, Any] | str,
     canary: str | None = None,
 ) -> str:
-    """Build the user prompt for a case (summary + key fields). Optionally append canary."""
+    """Build the user prompt for a case (summary + key fields). Optionally append canary.
+
+    structured_fields may be passed pre-serialized (as returned by json.dumps(..., indent=2)).
+    """
+    if not isinstance(structured_fields, str):
+        structured_fields = _dump_fields(structured_fields)
     parts = [
         "Case summary:",
         summary,
         "",
         "Structured fields (synthetic):",
-        json.dumps(structured_fields, indent=2),
+        structured_fields,
     ]
     if canary:
         parts.append(f"\n[Ref: {canary}]")
@@ -48,21 +93,34 @@ class ParseResult:
     error: str | None = None
 
 
+def _parse_json(text: str) -> Any:
+    """json.loads(text) semantics, via orjson where it agrees.
+
+    orjson rejects input json.loads accepts (NaN/Infinity, lone surrogate escapes, ...), so on
+    any rejection the stdlib parser decides, and its JSONDecodeError (message included) is what
+    propagates. ParseResult therefore never depends on whether orjson is installed.
+    """
+    try:
+        return loads(text)
+    except ValueError:
+        return json.loads(text)
+
+
 def _extract_json_block(text: str) -> str | None:
     """Try to extract a JSON object from text (e.g. inside ```json ... ```)."""
     text = text.strip()
     # Try raw parse first
     try:
-        json.loads(text)
+        _parse_json(text)
         return text
     except json.JSONDecodeError:
         pass
     # Try code block
-    m = re.search(r"```(?:json)?\s*([\s\S]*?)```", text)
+    m = _CODE_BLOCK_RE.search(text)
     if m:
         return m.group(1).strip()
     # Try first { ... }
-    m = re.search(r"\{[\s\S]*\}", text)
+    m = _OBJ_RE.search(text)
     if m:
         return m.group(0)
     return None
@@ -71,7 +129,7 @@ def _extract_json_block(text: str) -> str | None:
 def _repair_common(text: str) -> str:
     """Simple repairs: trailing commas, single quotes."""
     # Remove trailing commas before ] or }
-    text = re.sub(r",\s*([}\]])", r"\1", text)
+    text = _TRAIL_COMMA_RE.sub(r"\1", text)
     # Replace single quotes with double (naive)
     # Only in strings to avoid breaking already-valid JSON
     return text
@@ -99,7 +157,7 @@ def parse_model_output(
     for attempt in range(max_repair_attempts + 1):
         to_try = _repair_common(extracted) if attempt > 0 else extracted
         try:
-            obj = json.loads(to_try)
+            obj = _parse_json(to_try)
         except json.JSONDecodeError as e:
             if attempt >= max_repair_attempts:
                 return ParseResult(
@@ -5,25 +5,29 @@ compute metrics, apply gates, build audit packet (JSON + PDF), figures/tables.
 
 from __future__ import annotations
 
+import functools
+import itertools
 import json
 import logging
 import os
 import subprocess
 import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
+from clap._json import iter_jsonl, write_json, write_jsonl
 from clap.config import config_hash, get_env_info, load_config
 from clap.data_gen import generate_all
 from clap.prompt_io import ParseResult, build_case_prompt, parse_model_output
-from clap.schema import load_schema, validate_base_case, validate_family_variant
+from clap.schema import load_schema, set_schema_cache_dir, validate_base_case, validate_family_variant
 from clap.metrics import (
+    FCResult,
     cfc_aggregate,
-    fc_aggregate,
     evaluate_gates,
-    pc_leakage_rate,
-    sng_check_case,
-    sng_pass_rate,
+    pc_any_leak,
+    sng_evaluate,
 )
 from clap.adapters import MockAdapter, CachedAdapter
 
@@ -33,13 +37,22 @@ try:
 except ImportError:
     OpenAIAdapter = None
 
-from clap.audit_packet import build_audit_packet_json, build_audit_packet_pdf
+from clap.audit_packet import _redact_canaries, build_audit_packet_json, build_audit_packet_pdf
 from clap.figures_tables import generate_figures_and_tables
 
 logger = logging.getLogger("clap.runner")
 
 
 def _get_git_commit() -> str:
+    # CI can export the commit and skip the subprocess (and its 5 s timeout) entirely
+    env_commit = os.environ.get("CLAP_GIT_COMMIT")
+    if env_commit:
+        return env_commit.strip()[:16]
+    return _git_rev_parse_head()
+
+
+@functools.lru_cache(maxsize=1)
+def _git_rev_parse_head() -> str:
     try:
         out = subprocess.run(
             ["git", "rev-parse", "HEAD"],
@@ -84,19 +97,62 @@ def _resolve_adapter(config: dict[str, Any]):
     return CachedAdapter(inner, cache_dir=cache_dir, enabled=cache_enabled)
 
 
-def _load_cases(data_dir: Path) -> tuple[list[dict], list[dict], dict[str, list[dict]]]:
+def _load_cases(data_dir: Path) -> tuple[list[dict], list[dict], dict[str, list[dict]], dict[str, str]]:
+    """Bases, variants, suites, and the case_id -> domain index (base and variant IDs alike)."""
     base_path = data_dir / "cases_base.jsonl"
     family_path = data_dir / "cases_family.jsonl"
     if not base_path.exists() or not family_path.exists():
         raise FileNotFoundError(f"Data not found. Run build-data first: {data_dir}")
-    bases = [json.loads(line) for line in base_path.read_text().strip().splitlines() if line]
-    variants = [json.loads(line) for line in family_path.read_text().strip().splitlines() if line]
+    bases = list(iter_jsonl(base_path))
+    variants = list(iter_jsonl(family_path))
     suites = {}
     for name in ["nrt100", "ambiguity", "policy_conflict"]:
         p = data_dir / "suites" / f"{name}.jsonl"
         if p.exists():
-            suites[name] = [json.loads(l) for l in p.read_text().strip().splitlines() if l]
-    return bases, variants, suites
+            suites[name] = list(iter_jsonl(p))
+    # Filled in place at load time: one pass over bases, one over variants
+    domain_index: dict[str, str] = {}
+    for b in bases:
+        domain_index[b["base_id"]] = b["domain"]
+    for v in variants:
+        domain_index[v["variant_id"]] = domain_index.get(v["base_id"], "unknown")
+    return bases, variants, suites, domain_index
+
+
+def _case_payloads(bases: list[dict], variants: list[dict]) -> list[tuple[str, str, dict]]:
+    """(case_id, summary, structured_fields) per model call: all bases, then all variants."""
+    payloads = [
+        (b["base_id"], b["summary"], {k: v for k, v in b.items() if k != "summary"})
+        for b in bases
+    ]
+    payloads.extend(
+        (v["variant_id"], v["summary"], {"variant_id": v["variant_id"], "base_id": v["base_id"], "expected_change_spec": v.get("expected_change_spec", {})})
+        for v in variants
+    )
+    return payloads
+
+
+def _generate_ordered(adapter: Any, jobs: list[tuple[str, str]], concurrency: int) -> Iterator[Any]:
+    """Run adapter.generate over (case_id, prompt) jobs on a thread pool; yield results in job order.
+
+    At most 2 * concurrency calls are queued or in flight, so huge case lists never
+    materialize one future per case. concurrency <= 1 runs serially in the caller's thread.
+    """
+    if concurrency <= 1:
+        for cid, prompt in jobs:
+            yield adapter.generate(prompt, case_id=cid)
+        return
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="clap-generate")
+    pending: deque[Future] = deque()
+    try:
+        for cid, prompt in jobs:
+            if len(pending) >= 2 * concurrency:
+                yield pending.popleft().result()
+            pending.append(pool.submit(adapter.generate, prompt, case_id=cid))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
 
 
 def run_evaluation(config_path: str | Path) -> dict[str, Any]:
@@ -118,67 +174,67 @@ def run_evaluation(config_path: str | Path) -> dict[str, Any]:
     for d in [audit_dir, tables_dir, figures_dir, logs_dir]:
         d.mkdir(parents=True, exist_ok=True)
 
-    # Structured logging
+    # Structured logging. Configure the root logger only once per process: basicConfig is a
+    # no-op once handlers exist, and building the FileHandler anyway would leak its open file.
     log_file = logs_dir / "clap_run.log"
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(name)s] %(levelname)s %(message)s",
-        handlers=[
-            logging.FileHandler(log_file, encoding="utf-8"),
-            logging.StreamHandler(sys.stdout),
-        ],
-    )
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(asctime)s [%(name)s] %(levelname)s %(message)s",
+            handlers=[
+                logging.FileHandler(log_file, encoding="utf-8"),
+                logging.StreamHandler(sys.stdout),
+            ],
+        )
     # Reduce noise from HTTP client (one line per request)
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("openai").setLevel(logging.WARNING)
 
+    # Opt-in: remember schemas that passed check_schema, keyed by file hash, across runs
+    set_schema_cache_dir(config["data"].get("schema_cache_dir"))
+
     # Ensure data exists
     if not (data_dir / "cases_base.jsonl").exists():
         logger.info("Building dataset...")
-        generate_all(seed, config["data"].get("n_base_cases", 250), data_dir)
+        generate_all(seed, config["data"].get("n_base_cases", 250), data_dir, legacy_rng=config["data"].get("legacy_rng", False))
 
-    bases, variants, suites = _load_cases(data_dir)
+    bases, variants, suites, domain_index = _load_cases(data_dir)
     adapter = _resolve_adapter(config)
     base_schema = load_schema("base_case")
     var_schema = load_schema("family_variant")
 
-    # Build base_id -> base, variant_id -> variant, base_id -> domain
-    base_by_id = {b["base_id"]: b for b in bases}
-    var_by_id = {v["variant_id"]: v for v in variants}
-    domain_by_base = {b["base_id"]: b["domain"] for b in bases}
-    domain_by_var = {v["variant_id"]: domain_by_base.get(v["base_id"], "unknown") for v in variants}
-
-    # Case list: all base + variant IDs we will run
-    case_ids = [b["base_id"] for b in bases]
-    for v in variants:
-        case_ids.append(v["variant_id"])
+    # Case list: all base + variant IDs we will run, with their prompt payloads
+    payloads = _case_payloads(bases, variants)
 
     # Run model and parse
     parse_results: dict[str, ParseResult] = {}
     raw_outputs: dict[str, str] = {}
     canary_by_case: dict[str, list[str]] = {}
-    n_cases = len(case_ids)
+    n_cases = len(payloads)
     progress_file = out_dir / "run_progress.json"
     logger.info("Running model on %d cases (this may take several minutes)...", n_cases)
     logger.info("Each response is saved to %s immediately.", config["models"].get("cache_dir", "outputs/cache"))
-    for i, cid in enumerate(case_ids):
+    has_canaries = bool(canaries)
+    if has_canaries:
+        canary_cycle = itertools.cycle(canaries)
+        jobs: list[tuple[str, str]] = []
+        for cid, summary, structured in payloads:
+            canary = next(canary_cycle)
+            canary_by_case[cid] = [canary] if canary else []
+            jobs.append((cid, build_case_prompt(summary, structured, canary)))
+    else:
+        # No canaries: no per-case canary list, and leakage below is 0 without scanning outputs
+        jobs = [(cid, build_case_prompt(summary, structured, None)) for cid, summary, structured in payloads]
+    if config["models"].get("batch_mode") and config["models"].get("adapter") == "openai":
+        # One Batch API job for every uncached prompt; returns once the job has finished
+        logger.info("Submitting uncached cases as one OpenAI batch job...")
+        generated: Iterator[Any] = iter(adapter.generate_batch_job([p for _, p in jobs], [c for c, _ in jobs]))
+    else:
+        generated = _generate_ordered(adapter, jobs, int(config["models"].get("concurrency", 16)))
+    for i, ((cid, _), result) in enumerate(zip(jobs, generated)):
         if (i + 1) % 10 == 0 or i == 0 or i == n_cases - 1:
             logger.info("Progress: %d / %d cases", i + 1, n_cases)
             sys.stdout.flush()
-        if cid in base_by_id:
-            case = base_by_id[cid]
-            summary = case["summary"]
-            structured = {k: v for k, v in case.items() if k != "summary"}
-        else:
-            case = var_by_id.get(cid)
-            if not case:
-                continue
-            summary = case["summary"]
-            structured = {"variant_id": cid, "base_id": case["base_id"], "expected_change_spec": case.get("expected_change_spec", {})}
-        canary = canaries[i % len(canaries)] if canaries else None
-        canary_by_case[cid] = [canary] if canary else []
-        prompt = build_case_prompt(summary, structured, canary)
-        result = adapter.generate(prompt, case_id=cid)
         raw_outputs[cid] = result.raw_text
         parse_results[cid] = parse_model_output(result.raw_text)
         # Save progress to disk every call (cache already has response; this records progress)
@@ -200,15 +256,25 @@ def run_evaluation(config_path: str | Path) -> dict[str, Any]:
         if case_id in parse_results and parse_results[case_id].parsed:
             out = parse_results[case_id].parsed
         nrt_results.append((expected, out))
-    nrt_pass = sng_pass_rate(nrt_results)
-
-    # FC
-    fc_inputs = [(r.valid_json, r.repaired) for r in parse_results.values()]
-    fc_result = fc_aggregate(fc_inputs)
-
-    # PC
-    pc_inputs = [(raw_outputs.get(cid, ""), canary_by_case.get(cid, [])) for cid in parse_results]
-    canary_leak = pc_leakage_rate(pc_inputs)
+    nrt_pass, nrt_case_pass = sng_evaluate(nrt_results)
+
+    # FC + PC in one pass over the parsed cases (same counts as fc_aggregate / pc_leakage_rate)
+    n_parsed = len(parse_results)
+    valid_count = repaired_count = leak_count = 0
+    for cid, r in parse_results.items():
+        if r.valid_json:
+            valid_count += 1
+        if r.repaired:
+            repaired_count += 1
+        if has_canaries and pc_any_leak(raw_outputs.get(cid, ""), canary_by_case.get(cid, ())):
+            leak_count += 1
+    fc_result = FCResult(
+        valid_count=valid_count,
+        repaired_count=repaired_count,
+        total=n_parsed,
+        schema_violations=n_parsed - valid_count,
+    )
+    canary_leak = leak_count / n_parsed if n_parsed else 0.0
 
     # CFC: need base+variant pairs
     family_results = []
@@ -218,8 +284,8 @@ def run_evaluation(config_path: str | Path) -> dict[str, Any]:
         base_out = parse_results[base_id].parsed if base_id in parse_results else None
         var_out = parse_results[var_id].parsed if var_id in parse_results else None
         family_results.append((v, base_out, var_out))
-    domain_index = {**domain_by_base, **domain_by_var}
-    cfc_by_domain, cfc_overall = cfc_aggregate(family_results, domain_index)
+    cfc_workers = int(config.get("cfc", {}).get("num_workers", 0))
+    cfc_by_domain, cfc_overall = cfc_aggregate(family_results, domain_index, num_workers=cfc_workers)
 
     # Gates
     gates_config = config.get("gates", {})
@@ -245,9 +311,31 @@ def run_evaluation(config_path: str | Path) -> dict[str, Any]:
         gate_result=gate_result,
         tables_dir=tables_dir,
         figures_dir=figures_dir,
+        emit_figures=outputs.get("emit_figures", True),
     )
 
     # Audit packet (after figures so figure_refs exist)
+    audit_dir.mkdir(parents=True, exist_ok=True)
+    run_id = f"{adapter.model_id}_{adapter.version}"
+    # Opt-in sidecar of per-case raw text (canaries redacted, as in worst_failures), streamed
+    # one record at a time; the packet only references it
+    raw_outputs_path = None
+    if outputs.get("emit_raw_outputs", False):
+        raw_outputs_path = audit_dir / f"raw_outputs_{run_id}.jsonl"
+        write_jsonl(
+            raw_outputs_path,
+            (
+                {
+                    "case_id": cid,
+                    "raw_text": _redact_canaries(raw_outputs[cid], canaries) if has_canaries else raw_outputs[cid],
+                    "valid_json": r.valid_json,
+                    "repaired": r.repaired,
+                }
+                for cid, r in parse_results.items()
+            ),
+        )
+        logger.info("Wrote raw outputs: %s", raw_outputs_path)
+
     packet = build_audit_packet_json(
         config=config,
         config_hash=config_hash(config),
@@ -259,20 +347,22 @@ def run_evaluation(config_path: str | Path) -> dict[str, Any]:
         cfc_by_domain=cfc_by_domain,
         cfc_overall=cfc_overall,
         gate_result=gate_result,
-        nrt_failures=[(nrt_cases[i].get("case_id"), nrt_cases[i].get("expected_risk_flags"), nrt_results[i][1]) for i in range(len(nrt_cases)) if not sng_check_case(nrt_results[i][0], nrt_results[i][1])],
-        parse_results=parse_results,
-        raw_outputs=raw_outputs,
+        nrt_failures=[
+            (case.get("case_id"), case.get("expected_risk_flags"), out)
+            for case, (_, out), passed in zip(nrt_cases, nrt_results, nrt_case_pass)
+            if not passed
+        ],
         canaries=canaries,
+        raw_outputs_path=str(raw_outputs_path) if raw_outputs_path is not None else None,
     )
 
-    audit_dir.mkdir(parents=True, exist_ok=True)
-    run_id = f"{adapter.model_id}_{adapter.version}"
     packet_path = audit_dir / f"audit_packet_{run_id}.json"
-    packet_path.write_text(json.dumps(packet, indent=2), encoding="utf-8")
+    write_json(packet_path, packet, indent=True)
     logger.info("Wrote audit packet JSON: %s", packet_path)
 
-    pdf_path = audit_dir / f"audit_packet_{run_id}.pdf"
-    build_audit_packet_pdf(packet, str(pdf_path), figures_dir)
-    logger.info("Wrote audit packet PDF: %s", pdf_path)
+    if outputs.get("emit_pdf", True):
+        pdf_path = audit_dir / f"audit_packet_{run_id}.pdf"
+        build_audit_packet_pdf(packet, str(pdf_path), figures_dir)
+        logger.info("Wrote audit packet PDF: %s", pdf_path)
 
     return packet
@@ -2,66 +2,111 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import importlib.metadata
 import json
+import os
 from pathlib import Path
 from typing import Any, Callable
 
 import jsonschema
 
+from clap._json import iter_jsonl
+
 # Package root relative to this file
 _SCHEMA_DIR = Path(__file__).resolve().parent.parent / "data" / "schema"
 
+# Optional on-disk record of schemas that already passed check_schema (off unless set)
+_CHECKED_STAMP_DIR: Path | None = None
+
+
+def set_schema_cache_dir(path: str | Path | None) -> None:
+    """Enable (or with None, disable) persisting check_schema results across runs under path."""
+    global _CHECKED_STAMP_DIR
+    _CHECKED_STAMP_DIR = Path(path) if path else None
+
 
 def _schema_path(name: str) -> Path:
     return _SCHEMA_DIR / f"{name}.json"
 
 
+@functools.lru_cache(maxsize=None)
 def load_schema(name: str) -> dict[str, Any]:
-    """Load a JSON Schema by name (e.g. base_case, family_variant, model_output, audit_packet, suite)."""
+    """Load a JSON Schema by name (e.g. base_case, family_variant, model_output, audit_packet, suite).
+
+    Parsed once per name; the returned dict is shared, so treat it as read-only.
+    """
     path = _schema_path(name)
     with open(path, encoding="utf-8") as f:
         return json.load(f)
 
 
+def _checked_stamp(name: str) -> Path | None:
+    """Stamp path keyed by the schema file bytes and jsonschema version, if stamping is enabled."""
+    if _CHECKED_STAMP_DIR is None:
+        return None
+    h = hashlib.blake2b(_schema_path(name).read_bytes(), digest_size=16)
+    h.update(importlib.metadata.version("jsonschema").encode())
+    return _CHECKED_STAMP_DIR / f"{name}-{h.hexdigest()}.ok"
+
+
+@functools.lru_cache(maxsize=None)
+def _get_validator(name: str) -> jsonschema.protocols.Validator:
+    """Checked validator for a named schema, built once (construction dwarfs a single validate)."""
+    schema = load_schema(name)
+    cls = jsonschema.validators.validator_for(schema)
+    # check_schema (meta-schema validation) is nearly all of the build cost; skip it
+    # when an earlier run already checked these exact bytes with this jsonschema.
+    stamp = _checked_stamp(name)
+    if stamp is None or not stamp.exists():
+        cls.check_schema(schema)
+        if stamp is not None:
+            os.makedirs(stamp.parent, exist_ok=True)
+            stamp.touch()
+    return cls(schema)
+
+
+def _validate_named(obj: dict[str, Any], name: str, schema: dict[str, Any] | None) -> None:
+    """Same errors as jsonschema.validate; reuses the cached validator unless a different schema is passed."""
+    if schema is not None and schema is not load_schema(name):
+        jsonschema.validate(instance=obj, schema=schema)
+        return
+    error = jsonschema.exceptions.best_match(_get_validator(name).iter_errors(obj))
+    if error is not None:
+        raise error
+
+
 def validate_base_case(obj: dict[str, Any], schema: dict[str, Any] | None = None) -> None:
     """Validate object against base_case schema. Raises jsonschema.ValidationError if invalid."""
-    schema = schema or load_schema("base_case")
-    jsonschema.validate(instance=obj, schema=schema)
+    _validate_named(obj, "base_case", schema or None)
 
 
 def validate_family_variant(obj: dict[str, Any], schema: dict[str, Any] | None = None) -> None:
     """Validate object against family_variant schema."""
-    schema = schema or load_schema("family_variant")
-    jsonschema.validate(instance=obj, schema=schema)
+    _validate_named(obj, "family_variant", schema or None)
 
 
 def validate_suite_entry(obj: dict[str, Any], schema: dict[str, Any] | None = None) -> None:
     """Validate object against suite schema."""
-    schema = schema or load_schema("suite")
-    jsonschema.validate(instance=obj, schema=schema)
+    _validate_named(obj, "suite", schema or None)
 
 
 def validate_model_output(obj: dict[str, Any], schema: dict[str, Any] | None = None) -> None:
     """Validate object against model_output schema."""
-    schema = schema or load_schema("model_output")
-    jsonschema.validate(instance=obj, schema=schema)
+    _validate_named(obj, "model_output", schema or None)
 
 
 def validate_audit_packet(obj: dict[str, Any], schema: dict[str, Any] | None = None) -> None:
     """Validate object against audit_packet schema."""
-    schema = schema or load_schema("audit_packet")
-    jsonschema.validate(instance=obj, schema=schema)
+    _validate_named(obj, "audit_packet", schema or None)
 
 
 def validate_jsonl_file(path: Path, schema_name: str, validator_fn: Callable[[dict, dict], None]) -> list[dict[str, Any]]:
     """Load JSONL and validate each line. Returns list of objects. Raises on first invalid line."""
     schema = load_schema(schema_name)
     objects = []
-    text = path.read_text(encoding="utf-8")
-    for i, line in enumerate(text.strip().splitlines()):
-        if not line.strip():
-            continue
-        obj = json.loads(line)
+    for obj in iter_jsonl(path):
         validator_fn(obj, schema)
         objects.append(obj)
     return objects
@@ -0,0 +1,19 @@
+"""Shared fixtures: generated datasets are cached per (seed, n_base) for the whole session."""
+
+import pytest
+
+from clap.data_gen import generate_all
+
+
+@pytest.fixture(scope="session")
+def cached_generate_all():
+    """generate_all(seed, n_base, out_dir=None), built once per key. Treat the result as read-only."""
+    cache = {}
+
+    def _gen(seed, n_base):
+        key = (seed, n_base)
+        if key not in cache:
+            cache[key] = generate_all(seed, n_base=n_base, out_dir=None)
+        return cache[key]
+
+    return _gen
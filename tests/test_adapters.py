@@ -0,0 +1,169 @@
+"""Tests for MockAdapter determinism and the CachedAdapter disk cache."""
+
+import json
+import os
+
+import pytest
+
+from clap.adapters import CachedAdapter, MockAdapter
+from clap.adapters.cached import _legacy_cache_key
+
+
+def test_mock_adapter_deterministic():
+    a = MockAdapter(seed=42, version="v1").generate("prompt", case_id="base_htn_0001")
+    b = MockAdapter(seed=42, version="v1").generate("prompt", case_id="base_htn_0001")
+    assert a.raw_text == b.raw_text
+    assert json.loads(a.raw_text)["risk_flags"]
+
+
+def test_cached_adapter_roundtrip(tmp_path):
+    adapter = CachedAdapter(MockAdapter(seed=42), cache_dir=tmp_path)
+    first = adapter.generate("prompt", case_id="c1")
+    second = CachedAdapter(MockAdapter(seed=42), cache_dir=tmp_path).generate("prompt", case_id="c1")
+    assert first.from_cache is False
+    assert second.from_cache is True
+    assert second.raw_text == first.raw_text
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permission bits")
+def test_cached_adapter_entry_mode_follows_umask(tmp_path):
+    from clap.adapters.cached import _UMASK
+
+    CachedAdapter(MockAdapter(seed=42), cache_dir=tmp_path).generate("prompt", case_id="c1")
+    (entry,) = [p for p in tmp_path.rglob("*") if p.is_file()]
+    # Same mode a plain open() would give, not mkstemp's 0600
+    assert entry.stat().st_mode & 0o777 == 0o666 & ~_UMASK
+
+
+def test_cached_adapter_reads_legacy_key(tmp_path):
+    key = _legacy_cache_key("prompt", "mock", "v1")
+    payload = {"raw_text": "legacy", "model_id": "mock", "version": "v1"}
+    (tmp_path / f"{key}.json").write_text(json.dumps(payload), encoding="utf-8")
+    result = CachedAdapter(MockAdapter(seed=42), cache_dir=tmp_path).generate("prompt", case_id="c1")
+    assert result.from_cache is True
+    assert result.raw_text == "legacy"
+
+
+def test_cached_adapter_memory_layer(tmp_path):
+    adapter = CachedAdapter(MockAdapter(seed=42), cache_dir=tmp_path, mem_cap=1)
+    adapter.generate("p1", case_id="c1")
+    for f in tmp_path.rglob("*.*"):
+        f.unlink()
+    # Served from memory even though the disk entry is gone
+    assert adapter.generate("p1", case_id="c1").from_cache is True
+    adapter.generate("p2", case_id="c2")
+    # p1 evicted (cap 1) and not on disk -> regenerated
+    assert adapter.generate("p1", case_id="c1").from_cache is False
+
+
+def test_openai_generate_batch_preserves_order(monkeypatch):
+    import asyncio
+    from types import SimpleNamespace
+
+    from clap.adapters import openai_adapter
+
+    class _FakeCompletions:
+        async def create(self, model, messages):
+            prompt = messages[-1]["content"]
+            await asyncio.sleep(0.01 if prompt == "p0" else 0)
+            msg = SimpleNamespace(content=f"out:{prompt}")
+            return SimpleNamespace(choices=[SimpleNamespace(message=msg)], usage=None)
+
+    class _FakeAsyncClient:
+        chat = SimpleNamespace(completions=_FakeCompletions())
+
+        async def close(self):
+            pass
+
+    monkeypatch.setattr(openai_adapter, "_get_async_client", lambda base_url=None: _FakeAsyncClient())
+    adapter = openai_adapter.OpenAIAdapter(model="m")
+    results = adapter.generate_batch(["p0", "p1", "p2"], ["c0", "c1", "c2"], concurrency=2)
+    assert [r.raw_text for r in results] == ["out:p0", "out:p1", "out:p2"]
+    assert all(r.version == "m" for r in results)
+
+
+def test_openai_agenerate_owns_its_client(monkeypatch):
+    import asyncio
+    from types import SimpleNamespace
+
+    from clap.adapters import openai_adapter
+
+    created, closed = [], []
+
+    class _FakeAsyncClient:
+        def __init__(self):
+            created.append(self)
+
+            async def create(model, messages):
+                msg = SimpleNamespace(content=f"out:{messages[-1]['content']}")
+                return SimpleNamespace(choices=[SimpleNamespace(message=msg)], usage=None)
+
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+        async def close(self):
+            closed.append(self)
+
+    monkeypatch.setattr(openai_adapter, "_get_async_client", lambda base_url=None: _FakeAsyncClient())
+    adapter = openai_adapter.OpenAIAdapter(model="m")
+
+    async def _two_calls():
+        first = await adapter.agenerate("p0", case_id="c0")
+        second = await adapter.agenerate("p1", case_id="c1")
+        await adapter.aclose()
+        return first, second
+
+    first, second = asyncio.run(_two_calls())
+    assert (first.raw_text, second.raw_text) == ("out:p0", "out:p1")
+    assert first.version == "m"
+    assert len(created) == 1 and closed == created  # one client per loop, closed by aclose
+    asyncio.run(_two_calls())
+    assert len(created) == 2
+
+
+def test_openai_batch_job_through_cache(tmp_path):
+    from types import SimpleNamespace
+
+    from clap.adapters import openai_adapter
+
+    submitted = []
+
+    class _FakeClient:
+        def __init__(self):
+            self.files = SimpleNamespace(create=self._upload, content=self._download)
+            self.batches = SimpleNamespace(create=self._create, retrieve=self._retrieve, cancel=None)
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._chat))
+
+        def _upload(self, file, purpose):
+            submitted.extend(json.loads(line) for line in file[1].splitlines())
+            return SimpleNamespace(id="file-in")
+
+        def _create(self, input_file_id, endpoint, completion_window):
+            return SimpleNamespace(id="b1", status="in_progress", output_file_id=None)
+
+        def _retrieve(self, batch_id):
+            return SimpleNamespace(id=batch_id, status="completed", output_file_id="file-out")
+
+        def _download(self, file_id):
+            lines = []
+            for req in submitted:
+                prompt = req["body"]["messages"][-1]["content"]
+                ok = prompt != "p1"  # p1 fails inside the batch and is retried singly
+                body = {"choices": [{"message": {"content": f"batch:{prompt}"}}], "usage": {"prompt_tokens": 3}}
+                resp = {"status_code": 200 if ok else 500, "body": body if ok else {}}
+                lines.append(json.dumps({"custom_id": req["custom_id"], "response": resp, "error": None}))
+            return SimpleNamespace(content="\n".join(lines).encode())
+
+        def _chat(self, model, messages):
+            msg = SimpleNamespace(content=f"single:{messages[-1]['content']}")
+            return SimpleNamespace(choices=[SimpleNamespace(message=msg)], usage=None)
+
+    inner = openai_adapter.OpenAIAdapter(model="m")
+    inner._client = _FakeClient()
+    adapter = CachedAdapter(inner, cache_dir=tmp_path)
+    adapter.generate("p0", case_id="c0")  # already cached: must not be resubmitted
+    submitted.clear()
+
+    results = adapter.generate_batch_job(["p0", "p1", "p2"], ["c0", "c1", "c2"], poll_interval=0)
+    assert [r.raw_text for r in results] == ["single:p0", "single:p1", "batch:p2"]
+    assert [req["body"]["messages"][-1]["content"] for req in submitted] == ["p1", "p2"]
+    assert adapter.generate("p2", case_id="c2").from_cache is True
@@ -0,0 +1,25 @@
+"""Config hashing tests."""
+
+import datetime
+
+from clap.config import config_hash
+
+
+def test_config_hash_memo_distinguishes_non_json_values():
+    # YAML dates and int keys encode like strings in JSON; the memo must not conflate them
+    as_date = config_hash({"run_date": datetime.date(2026, 2, 13)})
+    as_str = config_hash({"run_date": "2026-02-13"})
+    assert as_date != as_str
+    assert config_hash({"run_date": "2026-02-13"}) == as_str
+    assert config_hash({1: "x"}) != config_hash({"1": "x"})
+
+
+def test_config_hash_matches_yaml_dumper_for_any_config():
+    import hashlib
+
+    import yaml
+
+    # Non-JSON values the safe dumpers reject, and an empty-string key libyaml lays out differently
+    for config in ({"grid": (1, 2), "tags": {"a"}}, {"k": {"": 1.5, "x": None}}):
+        blob = yaml.dump(config, default_flow_style=False, sort_keys=True)
+        assert config_hash(config) == hashlib.sha256(blob.encode()).hexdigest()[:16]
@@ -20,8 +20,8 @@ def test_generate_all_seeded_reproducible():
         assert len(b1) == 20
 
 
-def test_generated_base_cases_valid():
-    bases, _, _ = generate_all(42, n_base=30, out_dir=None)
+def test_generated_base_cases_valid(cached_generate_all):
+    bases, _, _ = cached_generate_all(42, 30)
     schema = load_schema("base_case")
     for b in bases:
         validate_base_case(b, schema)
@@ -30,16 +30,16 @@ def test_generated_base_cases_valid():
     assert all(d in DOMAINS for d in domains_seen)
 
 
-def test_generated_variants_valid():
-    bases, variants, _ = generate_all(42, n_base=25, out_dir=None)
+def test_generated_variants_valid(cached_generate_all):
+    bases, variants, _ = cached_generate_all(42, 25)
     schema = load_schema("family_variant")
     for v in variants:
         validate_family_variant(v, schema)
     assert len(variants) >= len(bases)
 
 
-def test_suites_created():
-    _, _, suites = generate_all(42, n_base=50, out_dir=None)
+def test_suites_created(cached_generate_all):
+    _, _, suites = cached_generate_all(42, 50)
     assert "nrt100" in suites
     assert len(suites["nrt100"]) <= 100
     assert "ambiguity" in suites
@@ -57,3 +57,31 @@ def test_jsonl_files_written():
         assert len(lines) == 15
         obj = json.loads(lines[0])
         validate_base_case(obj)
+
+
+def test_suite_builders_do_not_reorder_bases(cached_generate_all):
+    bases, _, suites = cached_generate_all(42, 60)
+    assert [b["domain"] for b in bases] == [DOMAINS[i % len(DOMAINS)] for i in range(60)]
+    assert len(suites["ambiguity"]) == 50
+    assert len({e["base_id_or_variant_id"] for e in suites["policy_conflict"]}) == 50
+
+
+@pytest.mark.parametrize("legacy_rng", [False, True])
+def test_generate_all_rng_modes_reproducible(legacy_rng):
+    b1, _, s1 = generate_all(7, n_base=30, out_dir=None, legacy_rng=legacy_rng)
+    b2, _, s2 = generate_all(7, n_base=30, out_dir=None, legacy_rng=legacy_rng)
+    assert b1 == b2
+    assert s1 == s2
+
+
+def test_legacy_rng_reproduces_committed_data():
+    data_dir = Path(__file__).resolve().parent.parent / "data"
+
+    def read(rel):
+        return [json.loads(line) for line in (data_dir / rel).read_text(encoding="utf-8").splitlines() if line.strip()]
+
+    bases, variants, suites = generate_all(42, n_base=250, out_dir=None, legacy_rng=True)
+    assert bases == read("cases_base.jsonl")
+    assert variants == read("cases_family.jsonl")
+    for name, entries in suites.items():
+        assert entries == read(f"suites/{name}.jsonl")
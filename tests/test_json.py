@@ -0,0 +1,30 @@
+"""JSON / JSONL helper tests."""
+
+import pytest
+
+from clap._json import dumps_bytes, iter_jsonl, write_json, write_jsonl
+
+
+def test_iter_jsonl_mmap_matches_buffered(tmp_path):
+    records = [{"case_id": f"c{i}", "labs": {"Cr": 1.0 + i}, "note": "café"} for i in range(20)]
+    path = tmp_path / "cases.jsonl"
+    write_jsonl(path, records)
+    with open(path, "ab") as f:
+        f.write(b"\n  \n")  # blank lines are skipped on both paths
+    assert list(iter_jsonl(path, use_mmap=True)) == list(iter_jsonl(path, use_mmap=False)) == records
+    (tmp_path / "empty.jsonl").write_bytes(b"")
+    assert list(iter_jsonl(tmp_path / "empty.jsonl", use_mmap=True)) == []
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize("indent", [False, True])
+def test_write_json_matches_dumps_bytes(tmp_path, monkeypatch, use_orjson, indent):
+    import clap._json
+
+    if use_orjson and clap._json.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(clap._json, "orjson", None)
+    obj = {"note": "x\x7fy café", "vals": [1e-05, 1e16, 0.5], "nested": {"k": [None, True]}}
+    write_json(tmp_path / "p.json", obj, indent=indent)
+    assert (tmp_path / "p.json").read_bytes() == dumps_bytes(obj, indent)
@@ -2,8 +2,10 @@
 
 import pytest
 from clap.metrics import (
+    cfc_aggregate,
     cfc_score_single,
     sng_check_case,
+    sng_evaluate,
     sng_pass_rate,
     fc_aggregate,
     pc_check_leak,
@@ -29,6 +31,19 @@ def test_cfc_score_single_forbidden():
     assert forb >= 1
 
 
+def test_cfc_flags_keep_blank_entries_and_never_straddle():
+    # Blank entries normalize to "", which is a substring of any flag (baseline semantics)
+    spec = {"risk_flags_expected": [" "], "forbidden_changes": []}
+    assert cfc_score_single(spec, None, {"risk_flags": ["x"], "medications": []})[1] == 1
+    assert cfc_score_single(spec, None, {"risk_flags": [], "medications": []})[1] == 0
+    # A needle containing the join separator must not match across two separate flags
+    spec = {"risk_flags_expected": ["a\x01b"], "forbidden_changes": ["b\x01c"]}
+    out = {"risk_flags": ["a", "b"], "contraindications_flagged": ["b", "c"], "medications": []}
+    assert cfc_score_single(spec, None, out)[1:] == (0, 0)
+    assert sng_check_case(["a\x01b"], {"risk_flags": ["a", "b"]}) is False
+    assert sng_check_case(["a\x01b"], {"risk_flags": ["xa\x01by"]}) is True
+
+
 def test_sng_check_case_pass():
     assert sng_check_case(["safety_review_recommended"], {"risk_flags": ["safety_review_recommended"]}) is True
 
@@ -46,6 +61,18 @@ def test_sng_pass_rate():
     assert sng_pass_rate(results) == pytest.approx(2 / 3)
 
 
+def test_sng_evaluate_per_case_flags():
+    results = [
+        (["a"], {"risk_flags": ["a"]}),
+        (["c"], {"risk_flags": []}),
+        (["d"], None),
+    ]
+    rate, per_case = sng_evaluate(results)
+    assert per_case == [sng_check_case(e, o) for e, o in results] == [True, False, False]
+    assert rate == pytest.approx(1 / 3)
+    assert sng_evaluate([]) == (1.0, [])
+
+
 def test_fc_aggregate():
     pairs = [(True, False), (True, True), (False, False)]
     r = fc_aggregate(pairs)
@@ -84,3 +111,13 @@ def test_evaluate_gates_fail_nrt():
     r = evaluate_gates(nrt_pass_rate=0.9, json_validity=0.96, canary_leakage=0.0, cfc_overall=0.8, config_gates={"nrt_pass_rate_min": 1.0})
     assert r.overall == "FAIL"
     assert any("nrt" in f for f in r.failures)
+
+
+def test_cfc_aggregate_workers_match_serial():
+    spec = {"risk_flags_expected": ["renal"], "forbidden_changes": ["x"]}
+    family = [
+        ({"base_id": f"b{i % 3}", "expected_change_spec": spec}, None, {"risk_flags": ["renal"] if i % 2 else []})
+        for i in range(40)
+    ]
+    index = {"b0": "htn", "b1": "chf", "b2": "htn"}
+    assert cfc_aggregate(family, index, num_workers=2) == cfc_aggregate(family, index)
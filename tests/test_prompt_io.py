@@ -1,7 +1,9 @@
 """Tests for JSON repair and parse_model_output."""
 
+import json
+
 import pytest
-from clap.prompt_io import parse_model_output, ParseResult
+from clap.prompt_io import build_case_prompt, parse_model_output, ParseResult
 
 
 def test_parse_valid_json():
@@ -34,3 +36,35 @@ def test_parse_extract_from_code_block():
     r = parse_model_output(raw)
     assert r.valid_json is True
     assert r.parsed["uncertainty"]["level"] == "high"
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {"age": 71, "labs": {"Cr": 1.4}, "meds": ["M"]},
+        {"note": "caf\u00e9"},
+        {"labs": {"INR": 1e-05, "PLT": 1e16}},
+        {"labs": [float("nan"), float("inf"), -float("inf")]},
+        {"note": "x\x7fy"},
+    ],
+)
+def test_build_case_prompt_fields_match_stdlib_indent(fields):
+    # Prompt text feeds the cache key, so it must not depend on the JSON encoder
+    prompt = build_case_prompt("s", fields, canary="C")
+    assert json.dumps(fields, indent=2) in prompt
+    assert prompt == build_case_prompt("s", json.dumps(fields, indent=2), canary="C")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize("raw", ['{"a": NaN}', '{"a": -Infinity}', '"\\ud800"'])
+def test_parse_accepts_what_stdlib_accepts(raw, use_orjson, monkeypatch):
+    # valid_json feeds format compliance, so it must not depend on the [fast] extra
+    import clap._json
+
+    if use_orjson and clap._json.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(clap._json, "orjson", None)
+    r = parse_model_output(raw)
+    assert r.valid_json is True
+    assert type(r.parsed) is type(json.loads(raw))
@@ -0,0 +1,13 @@
+"""Runner helper tests."""
+
+from clap.adapters import CachedAdapter, MockAdapter
+from clap.runner import _generate_ordered
+
+
+def test_generate_ordered_threaded_preserves_order(tmp_path):
+    jobs = [(f"c{i}", f"p{i}") for i in range(50)]
+    serial = [r.raw_text for r in _generate_ordered(MockAdapter(seed=42), jobs, concurrency=1)]
+    # Small LRU so threads contend on eviction as well as insertion
+    adapter = CachedAdapter(MockAdapter(seed=42), cache_dir=tmp_path, mem_cap=4)
+    threaded = [r.raw_text for r in _generate_ordered(adapter, jobs, concurrency=8)]
+    assert threaded == serial
@@ -93,6 +93,13 @@ def test_validate_model_output_invalid_uncertainty_level():
         validate_model_output(out)
 
 
+def test_validate_model_output_honors_custom_schema():
+    # The cached validator only stands in for the packaged schema
+    validate_model_output({"anything": 1}, {"type": "object"})
+    with pytest.raises(Exception):
+        validate_model_output({"anything": 1})
+
+
 def test_validate_audit_packet_minimal():
     packet = {
         "metadata": {"timestamp": "2025-01-01T00:00:00Z", "git_commit_hash": "abc", "config_hash": "def", "env_info": {}, "cli_command": ""},
@@ -100,3 +107,22 @@ def test_validate_audit_packet_minimal():
         "suite_summaries": {},
     }
     validate_audit_packet(packet)
+
+
+def test_schema_check_stamp_skips_recheck(tmp_path, monkeypatch):
+    import jsonschema
+    from clap import schema as schema_mod
+
+    calls = []
+    cls = jsonschema.validators.validator_for(load_schema("suite"))
+    monkeypatch.setattr(cls, "check_schema", classmethod(lambda c, s, **kw: calls.append(s)))
+    schema_mod.set_schema_cache_dir(tmp_path)
+    try:
+        for _ in range(2):  # second build sees the stamp from the first
+            schema_mod._get_validator.cache_clear()
+            schema_mod._get_validator("suite")
+    finally:
+        schema_mod.set_schema_cache_dir(None)
+        schema_mod._get_validator.cache_clear()
+    assert len(calls) == 1
+    assert len(list(tmp_path.glob("suite-*.ok"))) == 1
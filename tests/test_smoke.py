@@ -11,9 +11,8 @@ from clap.data_gen import generate_all
 from clap.runner import run_evaluation
 
 
-def test_smoke_mock_pipeline(tmp_path):
-    """Run full pipeline with mock adapter and small data; check outputs exist."""
-    # Use config_mock with overrides via temp config
+def _write_smoke_config(tmp_path, **output_flags):
+    """config_mock with small data and every path under tmp_path; returns the config file path."""
     config_path = Path(__file__).resolve().parent.parent / "experiments" / "config_mock.yaml"
     config = load_config(config_path)
     config["data"]["n_base_cases"] = 20
@@ -25,11 +24,19 @@ def test_smoke_mock_pipeline(tmp_path):
         "tables_dir": str(tmp_path / "outputs" / "tables"),
         "figures_dir": str(tmp_path / "outputs" / "figures"),
         "logs_dir": str(tmp_path / "outputs" / "logs"),
+        **output_flags,
     }
     tmp_config = tmp_path / "config.yaml"
     import yaml
     with open(tmp_config, "w", encoding="utf-8") as f:
         yaml.dump(config, f)
+    return tmp_config
+
+
+def test_smoke_mock_pipeline(tmp_path):
+    """Run full pipeline with mock adapter and small data; check outputs exist."""
+    # Use config_mock with overrides via temp config
+    tmp_config = _write_smoke_config(tmp_path)
 
     run_evaluation(str(tmp_config))
 
@@ -43,9 +50,43 @@ def test_smoke_mock_pipeline(tmp_path):
     assert "metadata" in packet
     assert "gating" in packet
     assert packet["gating"]["overall"] in ("PASS", "FAIL")
+    assert "raw_outputs_path" not in packet
+    assert not list(audit_dir.glob("*.jsonl"))
 
     tables_dir = tmp_path / "outputs" / "tables"
     assert (tables_dir / "metrics_summary.csv").exists()
     figures_dir = tmp_path / "outputs" / "figures"
     assert figures_dir.exists()
     assert len(list(figures_dir.glob("*.png"))) >= 1
+
+
+def test_smoke_skips_pdf_and_figures_when_disabled(tmp_path):
+    run_evaluation(str(_write_smoke_config(tmp_path, emit_pdf=False, emit_figures=False)))
+    outputs = tmp_path / "outputs"
+    assert list((outputs / "audit_packets").glob("*.json"))
+    assert not list((outputs / "audit_packets").glob("*.pdf"))
+    assert not list((outputs / "figures").glob("*.png"))
+    assert (outputs / "tables" / "metrics_summary.csv").exists()
+
+
+def test_smoke_raw_outputs_sidecar_redacts_canaries(tmp_path, monkeypatch):
+    import dataclasses
+
+    from clap.adapters import MockAdapter
+
+    real_generate = MockAdapter.generate
+
+    def leaky_generate(self, case_prompt, case_id, **kwargs):
+        # Echo the prompt's canary line so the sidecar has something to redact
+        result = real_generate(self, case_prompt, case_id, **kwargs)
+        ref = case_prompt.rpartition("[Ref: ")[2]
+        return dataclasses.replace(result, raw_text=result.raw_text + " " + ref)
+
+    monkeypatch.setattr(MockAdapter, "generate", leaky_generate)
+    packet = run_evaluation(str(_write_smoke_config(tmp_path, emit_pdf=False, emit_figures=False, emit_raw_outputs=True)))
+    assert packet["suite_summaries"]["canary_leakage"] > 0
+    text = Path(packet["raw_outputs_path"]).read_text(encoding="utf-8")
+    records = [json.loads(line) for line in text.splitlines()]
+    assert records and all("[REDACTED]" in r["raw_text"] for r in records)
+    canaries = load_config(tmp_path / "config.yaml")["canaries"]
+    assert not any(c in text for c in canaries)